@@ -7,9 +7,9 @@ benchmarks the solver's performance on a dataset of puzzles.
   
 The Sudoku solver relies on NumPy for numerical computations and pandas for  
 processing CSV files containing Sudoku puzzles and their solutions. The solver  
-employs a combination of constraint propagation and brute force search to find  
-valid solutions, with an option to limit the number of iterations for the brute  
-force search.  
+employs a combination of constraint propagation and backtracking search to find  
+valid solutions, with an option to limit the number of iterations for the  
+backtracking search.  
   
 Typical usage example:  
     sudoku_solver = Sudoku()  
@@ -18,6 +18,7 @@ Typical usage example:
 """  
 
 import os
+import math
 import time
 import logging
 from typing import List, Optional, Union
@@ -27,12 +28,14 @@ import pandas as pd
 import numpy as np
 
 from sudoku_solver.utils import (
+    POPCOUNT,
     validate_3d_solution,
     iter_to_np_puzzle,
-    np_puzzle_to_string,
-    generate_cell_index_updates,
+    iter_to_masks,
+    masks_to_string,
+    validate_masks,
 )
-from sudoku_solver.techniques import apply_constraint_propagation
+from sudoku_solver.techniques import apply_constraint_propagation, apply_backtracking
 
 # Set up logging configuration
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
@@ -97,85 +100,48 @@ class Sudoku:
 
         Solves the Sudoku puzzle by pruning candidates based on filled values until no further
         reduction is possible. If only one combination is left, it returns the solution.
-        Otherwise, it attempts to brute force solutions.
+        Otherwise, it searches for a solution by backtracking over the remaining candidates.
 
         Args:
             unsolved_sudoku (str): The unsolved Sudoku puzzle in string or list format
-            max_iterations (int, optional): The maximum number of iterations to attempt before
+            max_iterations (int, optional): The maximum number of guesses to attempt before
                                             aborting. Defaults to 10,000,000.
 
         Returns:
-            str:    The solved Sudoku puzzle in string format, or None if a solution cannot be found
-                    within the maximum number of iterations.
+            str:    The solved Sudoku puzzle in string format, or None if the puzzle has no
+                    solution or one cannot be found within the maximum number of iterations.
 
         Raises:
             ValueError: If the provided Sudoku string is not valid.
         """
-        puzzle_2d, options_3d = iter_to_np_puzzle(unsolved_sudoku)
+        masks = iter_to_masks(unsolved_sudoku)
 
-        is_solved, puzzle_2d, options_3d = apply_constraint_propagation(
-            puzzle_2d, options_3d
-        )
-
-        if is_solved:
-            return np_puzzle_to_string(options_3d)
+        is_solved, masks = apply_constraint_propagation(masks)
 
-        num_possibilities: int = options_3d.sum(axis=2, dtype=np.longdouble).prod()
+        # Return answer if propagation solved the puzzle without conflicts
+        if is_solved and validate_masks(masks):
+            return masks_to_string(masks)
 
-        # Return answer if only one possibility left
-        if num_possibilities == 1:
-            return np_puzzle_to_string(options_3d)
+        is_solved, masks = apply_backtracking(masks, max_iterations)
 
-        if num_possibilities >= max_iterations or num_possibilities < 0:
+        if not is_solved:
             logging.info(
-                "More than %s combinations to check, aborting...",
+                "No solution found (search limit %s)",
                 format(max_iterations, "_"),
             )
             return None
 
-        it = np.nditer(puzzle_2d, flags=["multi_index"])
-        options_idx = [
-            [
-                (*it.multi_index, int(d))
-                for d in np.nditer(np.where(options_3d[*it.multi_index, :] == 1)[0])
-            ]
-            for v in it
-            if v == 0
-        ]
-
-        # Create the generator
-        generator = generate_cell_index_updates(*options_idx)
-
-        # Set-up first option
-        for idx in next(generator):
-            options_3d[*idx[1][:2], :] = 0
-            options_3d[*idx[1]] = 1
-
-        # Return first option if valid
-        if validate_3d_solution(options_3d):
-            return np_puzzle_to_string(options_3d)
-
-        # Iterate over other options
-        for changes in generator:
-            for idx in changes:
-                options_3d[*idx[0]] = 0
-                options_3d[*idx[1]] = 1
-
-            if validate_3d_solution(options_3d):
-                return np_puzzle_to_string(options_3d)
-
-        return None
+        return masks_to_string(masks)
 
     @staticmethod
     def dev_compute_possibilities(unsolved_sudoku: str) -> int:
         """
         Compute the total number of possible value combinations for an unsolved Sudoku puzzle.
 
-        This static method takes an unsolved Sudoku puzzle in string format, converts it to a
-        2D NumPy array representing the puzzle state, and a 3D NumPy array representing the possible
-        values for each cell. It then applies constraint propagation to reduce the number of
-        possibilities and computes the product of the sums of possible values for each cell, which
-        represents the total number of combinations.
+        This static method takes an unsolved Sudoku puzzle in string format and converts it to an
+        array of candidate bitmasks representing the possible values for each cell. It then applies
+        constraint propagation to reduce the number of possibilities and computes the product of the
+        number of possible values for each cell, which represents the total number of combinations.
 
         Args:
             unsolved_sudoku:    A string representation of the unsolved Sudoku puzzle, where each
@@ -187,14 +153,15 @@ class Sudoku:
             an integer.
         """
 
-        # Convert the input string to NumPy arrays for the puzzle state and possible values
-        puzzle_2d, options_3d = iter_to_np_puzzle(unsolved_sudoku)
+        # Convert the input string to candidate bitmasks for the possible values
+        masks = iter_to_masks(unsolved_sudoku)
 
         # Apply constraint propagation to reduce the number of possibilities
-        _, puzzle_2d, options_3d = apply_constraint_propagation(puzzle_2d, options_3d)
+        _, masks = apply_constraint_propagation(masks)
 
-        # Compute the product of the sums of possible values for each cell
-        num_possibilities: int = options_3d.sum(axis=2, dtype=np.longdouble).prod()
+        # Compute the product of the number of possible values for each cell, using Python integers
+        # to avoid overflows
+        num_possibilities: int = math.prod(POPCOUNT[masks].tolist())
 
         return num_possibilities
 
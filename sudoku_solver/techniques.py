@@ -1,238 +1,131 @@
 """  
 This module implements various Sudoku solving techniques used within the Sudoku solver.
-These techniques include finding singles, hidden singles, and applying elimination strategies
+These techniques include finding hidden singles and applying elimination strategies
 to reduce the options for each cell in the puzzle. The functions within this module
 work in tandem with the Sudoku class in the `sudoku.py` module to solve puzzles.  
   
-The techniques are built upon the representation of the Sudoku grid as a 3D NumPy array,   
-where the third dimension represents the possible numbers that can occupy a cell. The   
-module provides a higher-level function `apply_constraint_propagation` which encapsulates   
+The techniques are built upon the representation of the Sudoku grid as a flat array of 81   
+candidate bitmasks, where bit `d - 1` of a cell's mask is set if the number `d` can still occupy   
+that cell. The module provides a higher-level function `apply_constraint_propagation` which encapsulates   
 the application of all the implemented techniques in a sequence that facilitates the solving   
 of the puzzle.  
   
 The solving strategy is based on iteratively applying these techniques to prune the   
 set of possible values for each cell until the puzzle is solved or no further progress can be made.  
+Any cells left open are then filled in by `apply_backtracking`, a depth-first search over the   
+remaining candidates.  
 """  
 
-from typing import Tuple, Set
+import itertools
+from typing import Iterator, List, Tuple
 
 import numpy as np
 
-def _find_singles(options_3d: np.ndarray) -> Set[Tuple[int, int, int]]:
+from sudoku_solver.utils import (
+    BOX_OF,
+    MASK_TO_DIGIT,
+    NUM_CELLS,
+    PEERS,
+    POPCOUNT,
+    PUZZLE_SIZE,
+    UNIT_INDICES,
+)
+
+def _propagate_singles(masks: np.ndarray) -> bool:
     """
-    Find all unique options for digits in rows, columns, or subsquares of a Sudoku puzzle.
+    Remove the digits of all cells with a single candidate from their peers until a fixpoint.
 
-    This function identifies all cells within the options cube that represent the only possible
-    choice for a digit in its respective row, column, or 3x3 subsquare. It is a part of the
-    constraint propagation process in solving a Sudoku puzzle.
+    Each iteration is a single vectorized pass: the masks of the cells with a single candidate
+    are gathered for the peers of every cell, OR-ed together and cleared from the cell's mask.
 
     Args:
-        options_3d: A 3D NumPy array representing the possible values for each cell in the Sudoku
-                    puzzle. The first two dimensions correspond to the puzzle grid, and the third
-                    dimension contains a binary indicator for the possible values (1-9).
+        masks: An array of 81 uint16 candidate bitmasks, one per cell, updated in place.
 
     Returns:
-        A set of tuples, where each tuple contains the row index, column index, and value index
-        of a cell that represents a unique option for that digit in its row, column, or subsquare.
-
-    """
-    singles = set()
-
-    # Compute singles in columns
-    cols_w_singles = np.argwhere(options_3d.sum(axis=0) == 1)
-    row_indices = options_3d.argmax(axis=0)
-    singles.update({(row_indices[c, v], c, v) for c, v in cols_w_singles})
-
-    # Compute singles in rows
-    rows_w_singles = np.argwhere(options_3d.sum(axis=1) == 1)
-    col_indices = options_3d.argmax(axis=1)
-    singles.update({(r, col_indices[r, v], v) for r, v in rows_w_singles})
-
-    # Compute singles in 3x3 subsquares
-    for x in range(0, 9, 3):
-        for y in range(0, 9, 3):
-            subsquare = options_3d[y:y+3, x:x+3, :]
-            row_idx = np.argmax(subsquare.sum(axis=1), axis=0)
-            col_idx = np.argmax(subsquare.sum(axis=0), axis=0)
-            depth_idx = np.argwhere(subsquare.sum(axis=(0, 1)) == 1)
-
-            singles.update({
-                (r[0] + y, c[0] + x, v)
-                for r, c, v in zip(row_idx[depth_idx], col_idx[depth_idx], depth_idx.flatten())
-            })
-
-    return singles
-
-def _compute_hidden_singles(
-    singles: Set[Tuple[int, int, int]], puzzle_2d: np.ndarray
-) -> Set[Tuple[int, int, int]]:
+        A boolean indicating if any candidate was removed.
     """
-    Compute the hidden singles for a Sudoku puzzle.
-
-    A hidden single occurs when a cell is the only one in a row, column, or block
-    that can accommodate a certain number. This function calculates the hidden singles
-    by subtracting the known values from the set of all singles.
-
-    Args:
-        singles:    A set of tuples representing cells that are the only option for a digit
-                    in their row, column, or subsquare.
-        puzzle_2d:  A 2D NumPy array representing the current state of the Sudoku puzzle.
-
-    Returns:
-        A set of tuples representing the hidden singles in the puzzle.
-
-    """
-    # Compute already known values
-    known_values = {(*kv, puzzle_2d[*kv] - 1) for kv in np.argwhere(puzzle_2d > 0)}
-
-    # Return the hidden singles
-    return singles - known_values
-
-def _update_puzzle(
-    rows: np.array, cols: np.array, values: np.array, options_3d: np.ndarray
-) -> np.ndarray:
-    """
-    Update the puzzle state based on the known values and options cube.
+    has_progress: bool = False
+    while True:
+        # Keep only the masks of cells with a single candidate
+        single_masks = np.where((masks & (masks - 1)) == 0, masks, 0)
 
-    This function updates the options cube by setting the possibilities for known values
-    to zero in their respective rows, columns, and blocks. It then updates the puzzle state
-    based on the options cube, setting cells with multiple options back to zero.
+        # Remove the digits of the singles among the peers of each cell
+        peer_singles = np.bitwise_or.reduce(single_masks[PEERS], axis=1)
+        new_masks = masks & ~peer_singles
 
-    Args:
-        rows: A NumPy array of row indices for known values.
-        cols: A NumPy array of column indices for known values.
-        values: A NumPy array of values corresponding to the indices in rows and cols.
-        options_3d: A 3D NumPy array representing the possible values for each cell.
+        # Break out if no progress was made this iteration
+        if np.array_equal(new_masks, masks):
+            break
+        masks[:] = new_masks
+        has_progress = True
 
-    Returns:
-        A tuple containing the updated 2D puzzle state and the updated 3D options cube.
+    return has_progress
 
-    """
-    # Set column, row, and block to zero for all known cells
-    options_3d[rows, :, values] = 0
-    options_3d[:, cols, values] = 0
-    options_3d[rows, cols, :] = 0
-
-    # Calculate the starting indices of the 3x3 blocks
-    block_start_rows = 3 * (rows // 3)
-    block_start_cols = 3 * (cols // 3)
-
-    # Set the possibilities in the 3x3 blocks to zero
-    for block_start_row, block_start_col, value in zip(
-        block_start_rows, block_start_cols, values
-    ):
-        options_3d[
-            block_start_row : block_start_row + 3,
-            block_start_col : block_start_col + 3,
-            value,
-        ] = 0
-
-    # Set known cells back to one
-    options_3d[rows, cols, values] = 1
-
-    # Update the puzzle state based on the options cube
-    puzzle_2d = options_3d.argmax(axis=2) + 1
-    # Reset cells with multiple options to zero
-    puzzle_2d[options_3d.sum(axis=2) != 1] = 0
-
-    return puzzle_2d, options_3d
-
-def _apply_elimination(
-    puzzle_2d: np.ndarray, options_3d: np.ndarray
-) -> Tuple[bool, bool, np.ndarray, np.ndarray]:
+def _apply_elimination(masks: np.ndarray) -> Tuple[bool, bool, np.ndarray]:
     """
     Apply basic elimination rules to the Sudoku puzzle until no further progress is made.
 
-    This method iteratively applies Sudoku elimination rules to the given puzzle.
-    It updates the puzzle state and the options cube until the puzzle is solved
-    or no more progress can be made.
+    This method iteratively removes the digit of every cell with a single candidate from the
+    masks of its peers, until the puzzle is solved or no more progress can be made.
 
     Args:
-        puzzle_2d: A 2D NumPy array representing the current state of the Sudoku puzzle.
-        options_3d: A 3D NumPy array representing the possible values for each cell.
+        masks: An array of 81 uint16 candidate bitmasks, one per cell.
 
     Returns:
         A tuple containing:
         - has_progress: A boolean indicating if progress was made in the last iteration.
         - is_solved: A boolean indicating if the puzzle is solved.
-        - puzzle_2d: The updated 2D puzzle state.
-        - options_3d: The updated 3D options cube.
+        - masks: The updated candidate bitmasks.
     """
-    is_solved: bool = False
+    has_progress = _propagate_singles(masks)
+    is_solved: bool = np.all(MASK_TO_DIGIT[masks] > 0)
 
-    iteration_count: int = 0
-    while True:
-        iteration_count += 1
+    return has_progress, is_solved, masks
 
-        # Store the previous state of the puzzle to detect changes
-        prev_puzzle_2d = puzzle_2d
-        # prev_options_3d = options_3d.copy()
-        # Find the indices of cells with known values
-        known_cells = np.argwhere(puzzle_2d)
-
-        # Extract row and column indices, and adjust values for 0-indexing
-        rows, cols = known_cells[:, 0], known_cells[:, 1]
-        values = puzzle_2d[rows, cols] - 1
-
-        # Update puzzle based on known values
-        puzzle_2d, options_3d = _update_puzzle(rows, cols, values, options_3d)
-
-        # Check for changes in the puzzle state and break out if no progress was made this iteration
-        has_progress = not np.array_equal(puzzle_2d, prev_puzzle_2d)
-        if not has_progress:
-            has_progress = iteration_count > 1
-            break
-
-        # Check if the puzzle is solved and breakout if it is
-        is_solved = np.all(puzzle_2d > 0)
-        if is_solved:
-            break
-
-    return has_progress, is_solved, puzzle_2d, options_3d
-
-def _apply_hidden_singles(
-    puzzle_2d: np.ndarray, options_3d: np.ndarray
-) -> Tuple[bool, bool, np.ndarray, np.ndarray]:
+def _apply_hidden_singles(masks: np.ndarray) -> Tuple[bool, bool, np.ndarray]:
     """
     Apply the 'hidden singles' rule to the Sudoku puzzle.
 
     This function identifies 'hidden singles' in the puzzle, which are cells that are the only ones
-    in a row, column, or block that can accommodate a certain number. It updates the puzzle state
-    and options cube accordingly.
+    in a row, column, or block that can accommodate a certain number. For every unit, the digits
+    possible in exactly one of its cells are found by accumulating the digits seen at least once
+    and more than once, for all 27 units at the same time. The masks of these cells are reduced to
+    that number, leaving its removal from their peers to the elimination rules.
 
     Args:
-        puzzle_2d:  A 2D NumPy array representing the current state of the Sudoku puzzle.
-                    Each cell contains the value of the puzzle (1-9) or 0 if the value is unknown.
-        options_3d: A 3D NumPy array representing the possible values for each cell.
-                    The first two dimensions correspond to the puzzle grid, and the third dimension
-                    contains a binary indicator for the possible values (1-9).
+        masks:  An array of 81 uint16 candidate bitmasks, one per cell. Bit `d - 1` of a mask is
+                set if the digit `d` is a possible value for the cell.
 
     Returns:
         A tuple containing:
         - has_progress: A boolean indicating if progress was made in the last iteration.
         - is_solved: A boolean indicating if the puzzle is solved.
-        - puzzle_2d: The updated 2D puzzle state.
-        - options_3d: The updated 3D options cube.
+        - masks: The updated candidate bitmasks.
 
     """
-    prev_puzzle_2d = puzzle_2d.copy()
-    singles = _find_singles(options_3d)
-    hidden_singles = _compute_hidden_singles(singles, puzzle_2d)
+    unit_masks = masks[UNIT_INDICES]
+
+    # Collect the digits possible in at least one and in more than one cell of each unit
+    once = np.zeros(len(UNIT_INDICES), dtype=masks.dtype)
+    more = np.zeros(len(UNIT_INDICES), dtype=masks.dtype)
+    for position in range(PUZZLE_SIZE):
+        more |= once & unit_masks[:, position]
+        once |= unit_masks[:, position]
 
-    if not hidden_singles:
-        return False, False, puzzle_2d, options_3d
+    # Locate the cells holding the digits that are possible in only one cell of their unit
+    hidden_masks = unit_masks & (once & ~more)[:, np.newaxis]
+    units, positions = np.nonzero(hidden_masks)
+    cells, bits = UNIT_INDICES[units, positions], hidden_masks[units, positions]
 
-    # Update puzzle using newly discovered known values
-    puzzle_2d, options_3d = _update_puzzle(*map(np.array, zip(*hidden_singles)), options_3d)
+    # Fix newly discovered known values
+    has_progress: bool = bool(np.any(masks[cells] != bits))
+    masks[cells] = bits
 
-    has_progress: bool = not np.array_equal(puzzle_2d, prev_puzzle_2d)
-    is_solved: bool = np.all(puzzle_2d > 0)
+    is_solved: bool = np.all(MASK_TO_DIGIT[masks] > 0)
 
-    return has_progress, is_solved, puzzle_2d, options_3d
+    return has_progress, is_solved, masks
 
-def apply_constraint_propagation(
-    puzzle_2d: np.ndarray, options_3d: np.ndarray
-) -> Tuple[bool, np.ndarray, np.ndarray]:
+def apply_constraint_propagation(masks: np.ndarray) -> Tuple[bool, np.ndarray]:
     """
     Apply constraint propagation techniques to a Sudoku puzzle.
 
@@ -241,35 +134,27 @@ def apply_constraint_propagation(
     cell in the puzzle until the puzzle is solved or no further progress can be made.
 
     Args:
-        puzzle_2d:  A 2D NumPy array representing the current state of the Sudoku puzzle.
-                    Each cell contains the value of the puzzle (1-9) or 0 if the value is unknown.
-        options_3d: A 3D NumPy array representing the possible values for each cell.
-                    The first two dimensions correspond to the puzzle grid, and the third dimension
-                    contains a binary indicator for the possible values (1-9).
+        masks:  An array of 81 uint16 candidate bitmasks, one per cell in row-major order.
+                Bit `d - 1` of a mask is set if the digit `d` is a possible value for the cell.
 
     Returns:
         A tuple containing:
         - is_solved: A boolean indicating if the puzzle is solved.
-        - puzzle_2d: The updated 2D puzzle state.
-        - options_3d: The updated 3D options cube.
+        - masks: The updated candidate bitmasks.
 
     Raises:
-        ValueError: If the input arrays do not meet the required shapes or value constraints.
+        ValueError: If the input array does not meet the required shape.
     """
 
-    # Validate the input arrays
-    if not (isinstance(puzzle_2d, np.ndarray) and puzzle_2d.ndim == 2):
-        raise ValueError("puzzle_2d must be a 2D NumPy array.")
-    if not (isinstance(options_3d, np.ndarray) and options_3d.ndim == 3):
-        raise ValueError("options_3d must be a 3D NumPy array.")
+    # Validate the input array
+    if not (isinstance(masks, np.ndarray) and masks.shape == (NUM_CELLS,)):
+        raise ValueError("masks must be a 1D NumPy array of 81 candidate bitmasks.")
 
     iteration_count: int = 0
     while True:
         iteration_count += 1
         # Apply elimination technique
-        has_progress, is_solved, puzzle_2d, options_3d = _apply_elimination(
-            puzzle_2d, options_3d
-        )
+        has_progress, is_solved, masks = _apply_elimination(masks)
         if is_solved:
             break
 
@@ -277,13 +162,140 @@ def apply_constraint_propagation(
             break
 
         # Apply hidden singles technique
-        has_progress, is_solved, puzzle_2d, options_3d = _apply_hidden_singles(
-            puzzle_2d, options_3d
-        )
+        has_progress, is_solved, masks = _apply_hidden_singles(masks)
         if is_solved:
             break
 
         if has_progress:
             continue  # Restart the loop to apply elimination again
 
-    return is_solved, puzzle_2d, options_3d
+    return is_solved, masks
+
+def _backtrack(
+    cells: List[Tuple[int, int, int, int, int]],
+    row_used: List[int],
+    col_used: List[int],
+    box_used: List[int],
+    masks: np.ndarray,
+    depth: int,
+    iterations: Iterator[int],
+    max_iterations: int,
+) -> bool:
+    """
+    Recursively fill the open cells of a Sudoku puzzle using depth-first search.
+
+    At every level the open cell with the fewest legal digits is selected (Minimum Remaining
+    Values) and swapped to position `depth`, after which each of its legal digits is tried in
+    turn. The digits used in every row, column and subsquare are tracked as 9-bit integer
+    bitmasks, so only the units of the assigned cell need to be checked for each guess.
+
+    Args:
+        cells:          A list of (cell, row, column, subsquare, candidates) tuples for the open
+                        cells, where candidates is a 9-bit mask of the digits still possible for
+                        the cell.
+        row_used:       The bitmasks of digits placed in each row.
+        col_used:       The bitmasks of digits placed in each column.
+        box_used:       The bitmasks of digits placed in each subsquare.
+        masks:          The candidate bitmasks in which the solution is written once it is found.
+        depth:          The number of cells in `cells` that have been assigned a digit.
+        iterations:     A counter shared across the recursion to keep track of the guesses made.
+        max_iterations: The maximum number of guesses to make before aborting the search.
+
+    Returns:
+        True if all open cells were filled in, False otherwise.
+    """
+    if depth == len(cells):
+        return True
+
+    # Select the open cell with the fewest legal digits
+    best_idx, best_legal, best_count = depth, 0, 10
+    for idx in range(depth, len(cells)):
+        _, row, col, box, candidates = cells[idx]
+        legal = candidates & ~(row_used[row] | col_used[col] | box_used[box])
+        count = legal.bit_count()
+        if count < best_count:
+            best_idx, best_legal, best_count = idx, legal, count
+            if count <= 1:
+                break
+
+    cells[depth], cells[best_idx] = cells[best_idx], cells[depth]
+    cell, row, col, box, _ = cells[depth]
+
+    # Try each legal digit, from the lowest bit to the highest
+    legal = best_legal
+    while legal:
+        if next(iterations) >= max_iterations:
+            return False
+
+        bit = legal & -legal
+        legal &= legal - 1
+
+        row_used[row] |= bit
+        col_used[col] |= bit
+        box_used[box] |= bit
+
+        if _backtrack(
+            cells, row_used, col_used, box_used, masks, depth + 1, iterations, max_iterations
+        ):
+            masks[cell] = bit
+            return True
+
+        row_used[row] &= ~bit
+        col_used[col] &= ~bit
+        box_used[box] &= ~bit
+
+    return False
+
+def apply_backtracking(
+    masks: np.ndarray, max_iterations: int
+) -> Tuple[bool, np.ndarray]:
+    """
+    Solve the remaining open cells of a Sudoku puzzle using backtracking search.
+
+    This function is meant to be applied after constraint propagation. The remaining candidates of
+    each open cell are used as the starting point for a depth-first search that fills in the open
+    cells one by one. Since every guess is checked against the digits already used in its row,
+    column and subsquare, any completed grid is a valid solution.
+
+    Args:
+        masks:          An array of 81 uint16 candidate bitmasks, one per cell in row-major order.
+                        Bit `d - 1` of a mask is set if the digit `d` is a possible value for the
+                        cell.
+        max_iterations: The maximum number of guesses to make before aborting the search.
+
+    Returns:
+        A tuple containing:
+        - is_solved: A boolean indicating if the puzzle is solved.
+        - masks: The updated candidate bitmasks.
+    """
+    masks = masks.copy()
+    digits = MASK_TO_DIGIT[masks]
+
+    # Register the digits already placed in each row, column and subsquare in one pass
+    known_masks = np.where(digits > 0, masks, 0)[UNIT_INDICES]
+    unit_used = np.bitwise_or.reduce(known_masks, axis=1)
+
+    # Abort if a digit is placed more than once in any row, column or subsquare
+    if np.any(POPCOUNT[unit_used] != np.count_nonzero(known_masks, axis=1)):
+        return False, masks
+
+    row_used, col_used, box_used = unit_used.reshape(3, PUZZLE_SIZE).tolist()
+
+    # Use the remaining candidates of each open cell as the starting point of the search
+    open_cells = np.flatnonzero(digits == 0)
+    rows, cols = np.divmod(open_cells, PUZZLE_SIZE)
+    cells = list(
+        zip(
+            open_cells.tolist(),
+            rows.tolist(),
+            cols.tolist(),
+            BOX_OF[rows, cols].tolist(),
+            masks[open_cells].tolist(),
+        )
+    )
+
+    is_solved = _backtrack(
+        cells, row_used, col_used, box_used, masks, 0, itertools.count(), max_iterations
+    )
+
+    return is_solved, masks
@@ -7,16 +7,15 @@ The module provides essential functionalities such as `iter_to_np_puzzle` which
 a string representation of a Sudoku puzzle into a 2D array (the puzzle itself) and a 3D array   
 (the potential values for each cell). The `np_puzzle_to_string` function performs the inverse   
 operation, converting the 3D array representation back into a string format. The `validate_3d_solution`   
-function ensures that a given solution adheres to the rules of Sudoku. The `generate_cell_index_updates`   
-function creates a generator for efficiently iterating through the possible updates to a Sudoku puzzle during solving.  
+function ensures that a given solution adheres to the rules of Sudoku. The `iter_to_masks` and   
+`masks_to_string` functions do the same for the flat array of candidate bitmasks used by the solver.  
   
 Together, these utilities support the primary solving mechanism by providing data transformation   
 and validation capabilities.  
 """  
 
 
-import itertools
-from typing import Generator, Iterable, Iterator, Union, Tuple, Optional
+from typing import Iterable, Union, Tuple, Optional
 
 import numpy as np
 
@@ -24,6 +23,84 @@ PUZZLE_SIZE: int = 9
 PUZZLE_DEPTH: int = 9
 SHAPE_2D: Tuple[int, int] = (PUZZLE_SIZE, PUZZLE_SIZE)
 SHAPE_3D: Tuple[int, int, int] = (PUZZLE_SIZE, PUZZLE_SIZE, PUZZLE_DEPTH)
+NUM_CELLS: int = PUZZLE_SIZE * PUZZLE_SIZE
+NUM_PEERS: int = 20
+
+# Bit `d - 1` of a candidate mask is set when digit `d` is still possible for a cell
+DIGIT_BITS: np.ndarray = (1 << np.arange(PUZZLE_DEPTH)).astype(np.uint16)
+ALL_CANDIDATES: int = (1 << PUZZLE_DEPTH) - 1
+
+# Number of candidates of every candidate mask
+POPCOUNT: np.ndarray = np.array(
+    [bin(mask).count("1") for mask in range(1 << PUZZLE_DEPTH)], dtype=np.int8
+)
+
+# Digit of every candidate mask with a single bit set, zero for all other masks
+MASK_TO_DIGIT: np.ndarray = np.zeros(1 << PUZZLE_DEPTH, dtype=np.int8)
+MASK_TO_DIGIT[DIGIT_BITS] = np.arange(1, PUZZLE_DEPTH + 1)
+
+# The index tables below are stored as np.intp, the native index type of NumPy, so that they do
+# not have to be converted again each time they are used for fancy indexing in the solver loops
+
+# Subsquare index of every cell in the puzzle grid
+BOX_OF: np.ndarray = np.array(
+    [[3 * (r // 3) + c // 3 for c in range(PUZZLE_SIZE)] for r in range(PUZZLE_SIZE)],
+    dtype=np.intp,
+)
+
+# Flat indices of the cells in each row, column and subsquare
+_CELLS: np.ndarray = np.arange(NUM_CELLS, dtype=np.intp).reshape(SHAPE_2D)
+ROW_INDICES: np.ndarray = _CELLS
+COL_INDICES: np.ndarray = _CELLS.T.copy()
+BOX_INDICES: np.ndarray = _CELLS.reshape(3, 3, 3, 3).transpose(0, 2, 1, 3).reshape(SHAPE_2D)
+UNIT_INDICES: np.ndarray = np.concatenate([ROW_INDICES, COL_INDICES, BOX_INDICES])
+
+
+def _compute_peers() -> np.ndarray:
+    """Computes the indices of the cells sharing a row, column or subsquare with each cell.
+
+    Returns:
+        np.ndarray: An (81, 20) array where row `i` holds the flat indices of the peers of cell `i`.
+    """
+    peers = np.zeros((NUM_CELLS, NUM_PEERS), dtype=np.intp)
+    for cell in range(NUM_CELLS):
+        row, col = divmod(cell, PUZZLE_SIZE)
+        cell_peers = (
+            set(ROW_INDICES[row].tolist())
+            | set(COL_INDICES[col].tolist())
+            | set(BOX_INDICES[BOX_OF[row, col]].tolist())
+        )
+        cell_peers.discard(cell)
+        peers[cell] = sorted(cell_peers)
+    return peers
+
+
+PEERS: np.ndarray = _compute_peers()
+
+# Raw bytes of the digit counts per row, column or subsquare of a valid solution
+_UNIT_SUMS: bytes = np.ones(SHAPE_2D, dtype=np.int32).tobytes()
+
+# Translation table mapping the characters of a puzzle string to the byte values of its cells,
+# every character other than a digit or '.' is mapped to an invalid value
+_INVALID_VALUE: int = 0xFF
+_VALID_CHARS: dict = {**{ord(str(value)): value for value in range(10)}, ord("."): 0}
+_CHAR_TO_VALUE: bytes = bytes(
+    _VALID_CHARS.get(char, _INVALID_VALUE) for char in range(256)
+)
+
+# Translation tables for printing, puzzle digits are mapped to letters to tell them apart from
+# solution digits and every cell is then formatted as a three character wide field
+_ALPHABET: str = "abcdefghi"
+_DIGITS: str = "123456789"
+_DIGIT_TO_LETTER: dict = str.maketrans(_DIGITS, _ALPHABET)
+_CHAR_TO_FIELD: dict = str.maketrans(
+    {
+        **{letter: f"({digit})" for letter, digit in zip(_ALPHABET, _DIGITS)},
+        **{digit: f" {digit} " for digit in _DIGITS},
+        ".": " . ",
+        "0": " . ",
+    }
+)
 
 
 def print_puzzle(puzzle: Union[str, int], solution: Optional[str] = None) -> None:
@@ -35,10 +112,7 @@ def print_puzzle(puzzle: Union[str, int], solution: Optional[str] = None) -> Non
     """
 
     # Convert puzzle numbers to letters for readability to distinguish from solution values later
-    alphabet = "abcdefghi"
-    puzzle = "".join(
-        [alphabet[int(c) - 1] if c not in [".", "0"] else c for c in str(puzzle)]
-    )
+    puzzle = str(puzzle).translate(_DIGIT_TO_LETTER)
 
     # Overlay solution onto puzzle if provided
     if solution:
@@ -72,20 +146,8 @@ def print_puzzle(puzzle: Union[str, int], solution: Optional[str] = None) -> Non
     # Add the bottom line to complete the grid
     output.append(bottom_line)
 
-    # Helper function to replace characters with formatted numbers
-    def replace_chars(chars: str) -> str:
-        """Replaces characters in the puzzle output with formatted numbers."""
-        return "".join(
-            (
-                f"({alphabet.index(c) + 1})"
-                if c.isalpha()
-                else " . " if c in [".", "0"] else f" {c} " if c.isdigit() else c
-            )
-            for c in chars
-        )
-
-    # Print the final formatted sudoku grid
-    print("\n".join(replace_chars(line) for line in output))
+    # Print the final formatted sudoku grid, replacing characters with formatted numbers
+    print("\n".join(output).translate(_CHAR_TO_FIELD))
 
 
 def validate_3d_solution(candidate_solution: np.ndarray) -> bool:
@@ -106,28 +168,67 @@ def validate_3d_solution(candidate_solution: np.ndarray) -> bool:
     Returns:
         bool: True if the solution is valid, False otherwise.
     """
-    # Check if all rows and columns contain each digit only once
-    if not (
-        np.all(candidate_solution.sum(axis=1) == 1)
-        and np.all(candidate_solution.sum(axis=0) == 1)
-    ):
+    # Check if all rows contain each digit only once
+    if candidate_solution.sum(axis=1, dtype=np.int32).tobytes() != _UNIT_SUMS:
         return False
 
-    # Check if all cols contain each digit only once (sum is over rows)
-    if not np.all(candidate_solution.sum(axis=0) == 1):
+    # Check if all columns contain each digit only once
+    if candidate_solution.sum(axis=0, dtype=np.int32).tobytes() != _UNIT_SUMS:
         return False
 
-    # Check if boxes are valid (just the top left 4 need to be checked)
-    for i in range(0, 6, 3):
-        for j in range(0, 6, 3):
-            if not np.all(
-                candidate_solution[i : i + 3, j : j + 3].sum(axis=(0, 1)) == 1
-            ):
-                return False
+    # Check if all subsquares contain each digit only once
+    box_sums = candidate_solution.reshape(3, 3, 3, 3, PUZZLE_DEPTH).sum(
+        axis=(1, 3), dtype=np.int32
+    )
+    if box_sums.tobytes() != _UNIT_SUMS:
+        return False
 
     return True
 
 
+def validate_masks(masks: np.ndarray) -> bool:
+    """Check if a fully assigned array of candidate bitmasks is a valid Sudoku solution.
+
+    This is a cheaper alternative to `validate_3d_solution` for the solver's internal use. Since
+    every cell is expected to have exactly one bit set, a row, column or subsquare is valid if and
+    only if the bitwise OR of its masks contains all nine digits.
+
+    Args:
+        masks (np.ndarray): An array of 81 candidate bitmasks with a single bit set for each cell.
+
+    Returns:
+        bool: True if the solution is valid, False otherwise.
+    """
+    unit_digits = np.bitwise_or.reduce(masks[UNIT_INDICES], axis=1)
+    return bool(np.all(unit_digits == ALL_CANDIDATES))
+
+
+def _parse_puzzle(sudoku: Union[str, Iterable]) -> np.ndarray:
+    """Convert an iterable representing a sudoku puzzle into a 2D NumPy array of cell values.
+
+    Args:
+        sudoku (str): A string representing a sudoku puzzle.
+
+    Returns:
+        np.ndarray: The 2D puzzle array, with 0 for unknown cells.
+
+    Raises:
+        ValueError: If the puzzle does not consist of 81 digits or placeholders ('0' or '.').
+    """
+    if not isinstance(sudoku, str):
+        sudoku = "".join(map(str, sudoku))
+
+    # Non-ASCII characters are replaced by '?', which is rejected along with other invalid characters
+    cell_values = np.frombuffer(
+        sudoku.encode("ascii", errors="replace").translate(_CHAR_TO_VALUE), dtype=np.uint8
+    )
+    if cell_values.size != NUM_CELLS or np.any(cell_values == _INVALID_VALUE):
+        raise ValueError(
+            f"Expected {NUM_CELLS} characters from '0123456789.', but got {sudoku!r}."
+        )
+    return cell_values.reshape(SHAPE_2D).astype(np.int8)
+
+
 def iter_to_np_puzzle(sudoku: str) -> Tuple[np.ndarray, np.ndarray]:
     """Convert an iterable representing a sudoku puzzle into 2D and 3D NumPy array representations.
 
@@ -142,36 +243,47 @@ def iter_to_np_puzzle(sudoku: str) -> Tuple[np.ndarray, np.ndarray]:
 
     Returns:
         Tuple[np.ndarray, np.ndarray]: A tuple containing the 2D puzzle array and the 3D possibilities array.
-    """
-    if "." in sudoku:
-        sudoku = sudoku.replace(".", "0")
 
+    Raises:
+        ValueError: If the puzzle does not consist of 81 digits or placeholders ('0' or '.').
+    """
     # Convert the string to a 2D numpy array
-    puzzle_2d: np.ndarray = np.reshape(
-        np.fromiter(sudoku, dtype="l"), newshape=SHAPE_2D
-    )
-    options_3d: np.ndarray = np.zeros(SHAPE_3D, dtype="l")  # [row][column][depth]
-
-    # Update options_3d based on the non-zero values in puzzle_2d
-    nonzero_indices = np.nonzero(puzzle_2d)
-    values = puzzle_2d[nonzero_indices] - 1
-    options_3d[nonzero_indices[0], nonzero_indices[1], values] = 1
+    puzzle_2d: np.ndarray = _parse_puzzle(sudoku)
 
-    # Set all possibilities to 1 for cells with zero value in puzzle_2d
-    zero_indices = np.where(puzzle_2d == 0)
-    options_3d[zero_indices[0], zero_indices[1]] = 1
+    # One-hot encode the known values and set all possibilities to 1 for unknown cells
+    options_3d: np.ndarray = np.eye(PUZZLE_DEPTH, dtype=np.int8)[puzzle_2d - 1]  # [row][column][depth]
+    options_3d[puzzle_2d == 0] = 1
 
     return puzzle_2d, options_3d
 
 
+def iter_to_masks(sudoku: str) -> np.ndarray:
+    """Convert an iterable representing a sudoku puzzle into a flat array of candidate bitmasks.
+
+    Known cells get a mask with only the bit of their value set, unknown cells a mask with all
+    nine bits set.
+
+    Args:
+        sudoku (str): A string representing a sudoku puzzle.
+
+    Returns:
+        np.ndarray: An array of 81 uint16 candidate bitmasks, one per cell in row-major order.
+
+    Raises:
+        ValueError: If the puzzle does not consist of 81 digits or placeholders ('0' or '.').
+    """
+    values = _parse_puzzle(sudoku).ravel()
+    return np.where(values == 0, ALL_CANDIDATES, DIGIT_BITS[values - 1]).astype(np.uint16)
+
+
 def np_puzzle_to_string(np_puzzle: np.ndarray) -> str:
     """Converts a 3D NumPy array representing a Sudoku puzzle into a string.
 
     This method takes a 3D NumPy array where each 2D slice along the third axis represents
     the possibilities for each cell in the Sudoku grid. It converts this array into a string
-    representation of the puzzle by taking the argmax along the third axis, adding one to
-    shift from zero-based to one-based indexing, and then flattening the result into a 1D
-    array. This array is then joined into a single string.
+    representation of the puzzle by taking the argmax along the third axis and offsetting
+    it to the ASCII code of the corresponding digit. The raw bytes of the resulting array
+    are then decoded into a single string.
 
     Args:
         np_puzzle (np.ndarray): A 3D NumPy array representing the possibilities of a Sudoku puzzle.
@@ -193,35 +305,21 @@ def np_puzzle_to_string(np_puzzle: np.ndarray) -> str:
             f"Expected puzzle shape {SHAPE_3D}, but got {np_puzzle.shape}."
         )
 
-    # Convert the 3D possibilities array into a 1D string representation
-    puzzle_string: str = "".join(map(str, (np_puzzle.argmax(axis=2) + 1).flatten()))
+    # Convert the 3D possibilities array into ASCII digits and decode them as a single string
+    digits: np.ndarray = np_puzzle.argmax(axis=2).astype(np.uint8) + ord("1")
+    puzzle_string: str = digits.tobytes().decode("ascii")
     return puzzle_string
 
 
-def generate_cell_index_updates(
-    *iterables: Iterable[int],
-) -> Generator[Tuple[Tuple[None, int], ...], None, None]:
-    """Yields unique combinations of cell indices for updating a Sudoku puzzle's possibilities.
-
-    This generator function yields the indices of the cells in the Sudoku possibilities cube
-    that need to be updated. It provides a tuple with the indices of the cells that need to be
-    set to 1 and the indices of cells from the previous update that must be set to 0.
+def masks_to_string(masks: np.ndarray) -> str:
+    """Converts a flat array of candidate bitmasks into a Sudoku puzzle string.
 
     Args:
-        *iterables: Variable length iterable list of integers.
+        masks (np.ndarray): An array of 81 candidate bitmasks, one per cell in row-major order.
 
-    Yields:
-        Generator[Tuple[Tuple[None, int], ...], None, None]: A generator of tuples containing
-        the indices to be updated in the possibilities cube.
+    Returns:
+        str:    A string representation of the Sudoku puzzle, with numbers representing the cells
+                with a single candidate and zeros for all other cells.
     """
-    combinations: Iterator[Tuple[int, ...]] = itertools.product(*iterables)
-    prev_comb: Tuple[int, ...] = None  # Initialize the previous combination
-
-    comb = next(combinations)
-    yield tuple((None, c) for c in comb)  # Yield indices for the first combination
-    prev_comb = comb
-
-    for comb in combinations:
-        # Yield indices that are different from the previous combination
-        yield tuple((p, c) for c, p in zip(comb, prev_comb) if c != p)
-        prev_comb = comb
+    digits: np.ndarray = MASK_TO_DIGIT[masks].astype(np.uint8) + ord("0")
+    return digits.tobytes().decode("ascii")
@@ -1 +1,65 @@
-# Code for testing sudoku.py
\ No newline at end of file
+# Code for testing sudoku.py
+import unittest
+
+from sudoku_solver.sudoku import Sudoku
+from sudoku_solver.techniques import apply_constraint_propagation
+from sudoku_solver.utils import iter_to_masks, iter_to_np_puzzle
+
+EASY_PUZZLE = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+EASY_SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+HARD_PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+HARD_SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+class TestSolve(unittest.TestCase):
+    """Tests for Sudoku.solve."""
+
+    def test_easy_puzzle_solved_by_propagation(self):
+        is_solved, _ = apply_constraint_propagation(iter_to_masks(EASY_PUZZLE))
+        self.assertTrue(is_solved)
+        self.assertEqual(Sudoku.solve(EASY_PUZZLE), EASY_SOLUTION)
+
+    def test_hard_puzzle_solved_by_search(self):
+        is_solved, _ = apply_constraint_propagation(iter_to_masks(HARD_PUZZLE))
+        self.assertFalse(is_solved)
+        self.assertEqual(Sudoku.solve(HARD_PUZZLE), HARD_SOLUTION)
+
+    def test_dot_placeholders(self):
+        self.assertEqual(Sudoku.solve(HARD_PUZZLE.replace("0", ".")), HARD_SOLUTION)
+
+    def test_duplicate_givens_return_none(self):
+        with self.assertLogs(level="INFO") as logs:
+            self.assertIsNone(Sudoku.solve("11" + "0" * 79))
+        self.assertIn("No solution found", logs.output[0])
+
+    def test_small_max_iterations_returns_none(self):
+        with self.assertLogs(level="INFO"):
+            self.assertIsNone(Sudoku.solve(HARD_PUZZLE, max_iterations=10))
+
+    def test_list_input(self):
+        self.assertEqual(Sudoku.solve(list(EASY_PUZZLE)), EASY_SOLUTION)
+        self.assertEqual(Sudoku.solve(list(HARD_PUZZLE)), HARD_SOLUTION)
+
+
+class TestValidateSolution(unittest.TestCase):
+    """Tests for Sudoku.validate_solution."""
+
+    def test_valid_solution(self):
+        self.assertTrue(Sudoku.validate_solution(EASY_SOLUTION))
+        self.assertTrue(Sudoku.validate_solution(HARD_SOLUTION))
+
+    def test_swapped_cells_are_invalid(self):
+        swapped = EASY_SOLUTION[1] + EASY_SOLUTION[0] + EASY_SOLUTION[2:]
+        self.assertFalse(Sudoku.validate_solution(swapped))
+
+    def test_latin_square_with_invalid_subsquares(self):
+        # Every row and column holds each digit once, but the subsquares do not
+        latin_square = "".join(str((r + c) % 9 + 1) for r in range(9) for c in range(9))
+        _, options_3d = iter_to_np_puzzle(latin_square)
+        self.assertTrue((options_3d.sum(axis=0) == 1).all())
+        self.assertTrue((options_3d.sum(axis=1) == 1).all())
+        self.assertFalse(Sudoku.validate_solution(latin_square))
+
+
+if __name__ == "__main__":
+    unittest.main()
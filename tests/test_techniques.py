@@ -0,0 +1,77 @@
+# Code for testing techniques.py
+import unittest
+
+import numpy as np
+
+from sudoku_solver.techniques import (
+    _apply_hidden_singles,
+    _propagate_singles,
+    apply_constraint_propagation,
+)
+from sudoku_solver.utils import ALL_CANDIDATES, iter_to_masks, masks_to_string
+
+EASY_PUZZLE = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+EASY_SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+HARD_PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+HARD_SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+class TestHiddenSingles(unittest.TestCase):
+    """Tests for _apply_hidden_singles."""
+
+    def test_places_hidden_single(self):
+        # Digit 1 is possible in every cell of the first row except the first one,
+        # while every cell still has several candidates
+        masks = np.full(81, ALL_CANDIDATES, dtype=np.uint16)
+        masks[1:9] &= ~np.uint16(1)
+
+        # Naked singles cannot place anything
+        self.assertFalse(_propagate_singles(masks.copy()))
+
+        expected = masks.copy()
+        expected[0] = 1
+        has_progress, is_solved, masks = _apply_hidden_singles(masks)
+        self.assertTrue(has_progress)
+        self.assertFalse(is_solved)
+        self.assertEqual(masks[0], 1)
+        np.testing.assert_array_equal(masks, expected)
+
+    def test_no_hidden_singles(self):
+        masks = np.full(81, ALL_CANDIDATES, dtype=np.uint16)
+        has_progress, is_solved, masks = _apply_hidden_singles(masks)
+        self.assertFalse(has_progress)
+        self.assertFalse(is_solved)
+        self.assertTrue(np.all(masks == ALL_CANDIDATES))
+
+    def test_known_values_are_not_progress(self):
+        masks = iter_to_masks(EASY_SOLUTION)
+        has_progress, is_solved, _ = _apply_hidden_singles(masks)
+        self.assertFalse(has_progress)
+        self.assertTrue(is_solved)
+
+
+class TestConstraintPropagation(unittest.TestCase):
+    """Tests for apply_constraint_propagation."""
+
+    def test_solves_easy_puzzle(self):
+        is_solved, masks = apply_constraint_propagation(iter_to_masks(EASY_PUZZLE))
+        self.assertTrue(is_solved)
+        self.assertEqual(masks_to_string(masks), EASY_SOLUTION)
+
+    def test_keeps_solution_candidates(self):
+        is_solved, masks = apply_constraint_propagation(iter_to_masks(HARD_PUZZLE))
+        self.assertFalse(is_solved)
+
+        # Every known value is kept and no candidate of the solution is eliminated
+        for cell, (given, digit) in enumerate(zip(HARD_PUZZLE, HARD_SOLUTION)):
+            if given != "0":
+                self.assertEqual(masks[cell], 1 << (int(given) - 1))
+            self.assertTrue(masks[cell] & (1 << (int(digit) - 1)))
+
+    def test_invalid_shape_raises(self):
+        with self.assertRaises(ValueError):
+            apply_constraint_propagation(np.zeros((9, 9), dtype=np.uint16))
+
+
+if __name__ == "__main__":
+    unittest.main()
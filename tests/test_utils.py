@@ -1 +1,60 @@
-# Code for testing utils.py
\ No newline at end of file
+# Code for testing utils.py
+import unittest
+
+from sudoku_solver.sudoku import Sudoku
+from sudoku_solver.utils import (
+    ALL_CANDIDATES,
+    iter_to_masks,
+    iter_to_np_puzzle,
+    masks_to_string,
+)
+
+PUZZLE = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+
+
+class TestParsePuzzle(unittest.TestCase):
+    """Tests for the validation of puzzle input."""
+
+    def test_wrong_length_raises(self):
+        with self.assertRaises(ValueError):
+            iter_to_np_puzzle(PUZZLE[:-1])
+        with self.assertRaises(ValueError):
+            iter_to_np_puzzle(PUZZLE + "0")
+
+    def test_invalid_characters_raise(self):
+        for char in ("x", "-", " ", "²", "é"):
+            with self.subTest(char=char), self.assertRaises(ValueError):
+                iter_to_np_puzzle(char + PUZZLE[1:])
+
+    def test_control_characters_raise(self):
+        for char in ("\x00", "\x01", "\t"):
+            with self.subTest(char=char), self.assertRaises(ValueError):
+                iter_to_np_puzzle(char + PUZZLE[1:])
+        with self.assertRaises(ValueError):
+            Sudoku.solve("\t" * 81)
+
+
+class TestMaskConversions(unittest.TestCase):
+    """Tests for the conversions between puzzle strings and candidate bitmasks."""
+
+    def test_round_trip(self):
+        masks = iter_to_masks(PUZZLE)
+        self.assertEqual(masks.shape, (81,))
+        self.assertEqual(masks_to_string(masks), PUZZLE)
+
+    def test_round_trip_with_placeholders(self):
+        self.assertEqual(masks_to_string(iter_to_masks(PUZZLE.replace("0", "."))), PUZZLE)
+        self.assertEqual(masks_to_string(iter_to_masks("." * 81)), "0" * 81)
+
+    def test_mask_values(self):
+        masks = iter_to_masks(PUZZLE)
+        self.assertEqual(masks[0], 1 << 4)
+        self.assertEqual(masks[1], 1 << 2)
+        self.assertEqual(masks[2], ALL_CANDIDATES)
+
+    def test_list_input(self):
+        self.assertEqual(masks_to_string(iter_to_masks(list(PUZZLE))), PUZZLE)
+
+
+if __name__ == "__main__":
+    unittest.main()